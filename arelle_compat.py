@@ -0,0 +1,36 @@
+# Import this module before anything that imports arelle.
+
+# Compatibility Patch for imp in Python 3.12+
+try:
+    import imp
+except ImportError:
+    import importlib.util
+
+    class imp:
+        @staticmethod
+        def find_module(name, path=None):
+            spec = importlib.util.find_spec(name, path)
+            if spec is None:
+                raise ImportError(f"No module named {name}")
+            return None, spec.origin, ("", "", None)
+
+        @staticmethod
+        def load_module(name, file, pathname, description):
+            spec = importlib.util.spec_from_file_location(name, pathname)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            return module
+
+# Force inject the patched `imp` module into `sys.modules`
+import sys
+sys.modules["imp"] = imp
+
+# Compatibility Patch for collections.abc in Python 3.10+
+import collections
+if not hasattr(collections, "MutableSet"):
+    from collections.abc import MutableSet
+    collections.MutableSet = MutableSet
+
+if not hasattr(collections, "MutableMapping"):
+    from collections.abc import MutableMapping
+    collections.MutableMapping = MutableMapping
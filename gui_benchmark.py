@@ -0,0 +1,241 @@
+# Run Qt without a display unless the caller chose a platform
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+
+from PyQt5.QtCore import QCoreApplication, QEvent
+from PyQt5.QtWidgets import QApplication, QTreeWidget, QTreeWidgetItemIterator
+from load_taxonomy import TaxonomyViewer
+from memory_usage import current_rss, peak_rss
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_THRESHOLDS_PATH = os.path.join(REPO_DIR, "gui_thresholds.json")
+POPULATE_METHODS = ["populate_concepts", "populate_hierarchical", "populate_formulas",
+                    "populate_calculations", "populate_compare", "populate_tables"]
+MB = 1024 * 1024
+# Recorded timing limits never go below this, so sub-millisecond timings do not become zero limits
+MIN_SECONDS_THRESHOLD = 0.1
+
+
+def instrument_populate(viewer, timings):
+    """
+    Wraps the viewer's populate_* methods so each call records its duration
+    under the title of the tab it fills.
+    """
+    tab_titles = {id(viewer.tabs.widget(i)): viewer.tabs.tabText(i) for i in range(viewer.tabs.count())}
+    # populate_tables fills its own tab instead of taking the widget as first argument
+    tab_titles["populate_tables"] = tab_titles[id(viewer.tab_tables)]
+
+    def wrap(name, method):
+        def timed(*args, **kwargs):
+            tab = tab_titles.get(name) or (tab_titles.get(id(args[0]), name) if args else name)
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                timings[tab] = timings.get(tab, 0.0) + time.perf_counter() - started
+        return timed
+
+    for name in POPULATE_METHODS:
+        setattr(viewer, name, wrap(name, getattr(viewer, name)))
+
+
+def count_tree_items(viewer):
+    """Counts the QTreeWidgetItems across all tree tabs."""
+    total = 0
+    for i in range(viewer.tabs.count()):
+        tree = viewer.tabs.widget(i)
+        if isinstance(tree, QTreeWidget):
+            iterator = QTreeWidgetItemIterator(tree)
+            while iterator.value():
+                total += 1
+                iterator += 1
+    return total
+
+
+def benchmark_fixture(app, fixture, low_memory=False):
+    """
+    Drives one TaxonomyViewer end-to-end on a fixture taxonomy.
+
+    :return: A dictionary of metric name to measured value.
+    """
+    viewer = TaxonomyViewer()
+    viewer.show()
+    app.processEvents()
+
+    populate_timings = {}
+    instrument_populate(viewer, populate_timings)
+    viewer.low_memory_checkbox.setChecked(low_memory)
+    viewer.file_path_input.setText(fixture)
+
+    started = time.perf_counter()
+    viewer.load_taxonomy()
+    app.processEvents()
+    viewer.repaint()
+    first_paint = time.perf_counter() - started
+
+    if viewer.taxonomy_data is None:
+        viewer.close()
+        raise Exception(f"Viewer failed to load {fixture}: {viewer.statusBar().currentMessage()}")
+
+    metrics = {"load_to_first_paint_s": first_paint}
+    for tab, seconds in populate_timings.items():
+        metrics[f"populate_s[{tab}]"] = seconds
+
+    expand_total = 0.0
+    for i in range(viewer.tabs.count()):
+        tree = viewer.tabs.widget(i)
+        if not isinstance(tree, QTreeWidget):
+            continue
+        viewer.tabs.setCurrentIndex(i)
+        started = time.perf_counter()
+        tree.expandAll()
+        app.processEvents()
+        tree.viewport().repaint()
+        expand_total += time.perf_counter() - started
+    metrics["expand_all_s"] = expand_total
+
+    metrics["tree_items"] = count_tree_items(viewer)
+    metrics["widgets"] = len(app.allWidgets())
+    metrics["rss_mb"] = (current_rss() or 0) / MB
+    metrics["peak_rss_mb"] = (peak_rss() or 0) / MB
+
+    viewer.close()
+    viewer.deleteLater()
+    # processEvents() skips DeferredDelete outside a running event loop
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    return metrics
+
+
+def run_fixture_isolated(fixture, low_memory=False):
+    """
+    Benchmarks one fixture in a fresh interpreter.
+
+    Widget counts, RSS and peak RSS are process-wide, so sharing a process
+    would make each fixture's metrics depend on the fixtures run before it.
+
+    :return: The fixture's metrics.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        metrics_path = os.path.join(temp_dir, "metrics.json")
+        command = [sys.executable, os.path.abspath(__file__), "--single", fixture, "--metrics-out", metrics_path]
+        if low_memory:
+            command.append("--low-memory")
+        result = subprocess.run(command)
+        if result.returncode != 0 or not os.path.exists(metrics_path):
+            raise Exception(f"Benchmark process for {fixture} exited with code {result.returncode}")
+        with open(metrics_path, encoding="utf-8") as f:
+            return json.load(f)
+
+
+def load_thresholds(path):
+    if not os.path.exists(path):
+        return {"default": {}, "fixtures": {}}
+    with open(path, encoding="utf-8") as f:
+        thresholds = json.load(f)
+    thresholds.setdefault("default", {})
+    thresholds.setdefault("fixtures", {})
+    return thresholds
+
+
+def fixture_key(fixture):
+    """Names a fixture in the thresholds file by its path relative to the repository."""
+    return os.path.relpath(os.path.abspath(fixture), REPO_DIR).replace(os.sep, "/")
+
+
+def record_thresholds(metrics, headroom):
+    """Turns measured metrics into limits that leave ``headroom`` times the measured value."""
+    limits = {}
+    for metric, value in metrics.items():
+        limit = round(value * headroom, 3)
+        if metric.endswith("_s") or metric.startswith("populate_s["):
+            limit = max(limit, MIN_SECONDS_THRESHOLD)
+        limits[metric] = limit
+    return limits
+
+
+def thresholds_for(thresholds, fixture, metric):
+    """Returns the limit for a metric, preferring the fixture's own entry over the defaults."""
+    fixture_limits = thresholds["fixtures"].get(fixture_key(fixture), {})
+    if metric in fixture_limits:
+        return fixture_limits[metric]
+    if metric.startswith("populate_s[") and metric not in thresholds["default"]:
+        return thresholds["default"].get("populate_s")
+    return thresholds["default"].get(metric)
+
+
+def check_thresholds(results, thresholds):
+    """Lists every metric that exceeds its stored threshold."""
+    violations = []
+    for fixture, metrics in results.items():
+        for metric, value in metrics.items():
+            limit = thresholds_for(thresholds, fixture, metric)
+            if limit is not None and value > limit:
+                violations.append(f"{fixture_key(fixture)}: {metric} = {value:.3f} exceeds {limit}")
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless performance check of the TaxonomyViewer populate paths.")
+    parser.add_argument("fixtures", nargs="*", help="Fixture taxonomy entry points")
+    parser.add_argument("--thresholds", default=DEFAULT_THRESHOLDS_PATH, help="JSON file of metric thresholds")
+    parser.add_argument("--low-memory", action="store_true", help="Load in low-memory mode")
+    parser.add_argument("--json", help="Also write the measured metrics to this file")
+    parser.add_argument("--update-thresholds", type=float, metavar="HEADROOM",
+                        help="Store the measured metrics times HEADROOM as the fixtures' thresholds")
+    # Internal: benchmark a single fixture in this process and write its metrics
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    parser.add_argument("--metrics-out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        app = QApplication.instance() or QApplication(sys.argv[:1])
+        metrics = benchmark_fixture(app, args.single, args.low_memory)
+        with open(args.metrics_out, "w", encoding="utf-8") as f:
+            json.dump(metrics, f)
+        return
+
+    if not args.fixtures:
+        parser.error("at least one fixture is required")
+
+    results = {}
+    failed = []
+    for fixture in args.fixtures:
+        print(f"\n⏱ Benchmarking {fixture}")
+        try:
+            results[fixture] = run_fixture_isolated(fixture, args.low_memory)
+        except Exception as e:
+            print(f"❌ ERROR: {e}")
+            failed.append(fixture)
+            continue
+        for metric, value in results[fixture].items():
+            print(f"  {metric:<45} {value:>12.3f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    thresholds = load_thresholds(args.thresholds)
+    if args.update_thresholds:
+        for fixture, metrics in results.items():
+            thresholds["fixtures"][fixture_key(fixture)] = record_thresholds(metrics, args.update_thresholds)
+        with open(args.thresholds, "w", encoding="utf-8") as f:
+            json.dump(thresholds, f, indent=2, sort_keys=True)
+        print(f"\n📝 Updated thresholds in {args.thresholds}")
+
+    violations = check_thresholds(results, thresholds)
+    for violation in violations:
+        print(f"❌ {violation}")
+    if violations or failed:
+        sys.exit(1)
+    print("\n✅ All GUI metrics within thresholds")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+import csv
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+EXPORT_COLUMNS = ["tab", "elr", "depth", "path", "parent", "child", "order", "weight", "attributes"]
+EXPORT_TABS = ["concepts", "presentation", "calculations", "dimensions", "formulas"]
+EXPORT_FORMATS = {".csv": "csv", ".xlsx": "xlsx", ".parquet": "parquet"}
+PATH_SEPARATOR = " / "
+CHUNK_SIZE = 10000
+EXCEL_MAX_ROWS = 1048575  # one row is taken by the header
+
+FORMULA_ATTRIBUTES = ["type", "label", "cover", "complement", "bindAsSequence", "expression", "value"]
+ELR_PREFIX = re.compile(r"^\[([^\]]*)\] ")
+
+
+def split_elr(name):
+    """
+    Splits the ``[elr] `` prefix the dimension and calculation parsers put on
+    role-level names, where ``elr`` is the last segment of the role URI.
+
+    :return: A tuple of (elr, name without the prefix); elr is empty when
+             the name has no prefix.
+    """
+    match = ELR_PREFIX.match(name)
+    if not match:
+        return "", name
+    return match.group(1), name[match.end():]
+
+
+def make_row(tab, elr, path, order, weight=None, attributes=None):
+    """Builds one flat export row for the node at the end of ``path``."""
+    return {
+        "tab": tab,
+        "elr": elr,
+        "depth": len(path) - 1,
+        "path": PATH_SEPARATOR.join(path),
+        "parent": path[-2] if len(path) > 1 else "",
+        "child": path[-1],
+        "order": order,
+        "weight": float(weight) if weight not in (None, "") else None,
+        "attributes": json.dumps(attributes, default=str) if attributes else "",
+    }
+
+
+def iter_concept_rows(concepts):
+    """Yields one row per concept."""
+    for order, (qname, details) in enumerate(concepts.items()):
+        yield make_row("concepts", "", (qname,), order, attributes=details)
+
+
+def iter_tree_rows(tab, hierarchy):
+    """
+    Yields rows for presentation and dimension trees, whose nodes keep their
+    children in a list of ``{"name", "abstract", "children"}`` dictionaries.
+    """
+    for root_order, (root_name, root) in enumerate(hierarchy.items()):
+        # Dimension roots carry their ELR as a "[role] " prefix, which moves to the elr column
+        elr, root_name = split_elr(root_name)
+
+        stack = [((root_name,), root_order, root)]
+        while stack:
+            path, order, node = stack.pop()
+            yield make_row(tab, elr, path, order, attributes={"abstract": node.get("abstract", False)})
+            children = node.get("children", [])
+            for child_order in range(len(children) - 1, -1, -1):
+                child = children[child_order]
+                stack.append((path + (child["name"],), child_order, child))
+
+
+def iter_calculation_rows(calculations):
+    """
+    Yields rows for calculation trees, grouped by role.
+
+    Roles are keyed ``[elr] definition``; the elr goes into the elr column as
+    for dimensions, and a role without a single root concept, which the
+    parser stores under the role name itself, is shown by its definition.
+    """
+    for role_name, role_data in calculations.items():
+        elr, _ = split_elr(role_name)
+        stack = [((split_elr(name)[1] if name == role_name else name,), order, details)
+                 for order, (name, details) in enumerate(role_data.items())]
+        stack.reverse()
+        while stack:
+            path, order, details = stack.pop()
+            balance = details.get("balance")
+            yield make_row("calculations", elr, path, order, details.get("weight"),
+                           {"balance": balance} if balance else None)
+            children = list(details.get("children", {}).items())
+            for child_order in range(len(children) - 1, -1, -1):
+                child_name, child_details = children[child_order]
+                stack.append((path + (child_name,), child_order, child_details))
+
+
+def iter_formula_rows(formulas):
+    """Yields rows for formula objects, starting from the assertion sets."""
+    for root_order, (root_name, root_hierarchy) in enumerate(formulas.items()):
+        root_details = root_hierarchy.get(root_name, root_hierarchy)
+        stack = [((root_name,), root_order, root_details)]
+        while stack:
+            path, order, details = stack.pop()
+            attributes = {key: details[key] for key in FORMULA_ATTRIBUTES if details.get(key) not in (None, "")}
+            yield make_row("formulas", "", path, order, attributes=attributes)
+            children = list(details.get("children", {}).items())
+            for child_order in range(len(children) - 1, -1, -1):
+                child_name, child_details = children[child_order]
+                stack.append((path + (child_name,), child_order, child_details))
+
+
+def iter_rows(data, tab):
+    """Yields the flat rows of one tab of extracted taxonomy data."""
+    if tab == "concepts":
+        return iter_concept_rows(data.get("concepts") or {})
+    if tab in ("presentation", "dimensions"):
+        return iter_tree_rows(tab, data.get(tab) or {})
+    if tab == "calculations":
+        return iter_calculation_rows(data.get("calculations") or {})
+    if tab == "formulas":
+        return iter_formula_rows(data.get("formulas") or {})
+    raise ValueError(f"Unknown tab: {tab}")
+
+
+class CsvRowWriter:
+    """Writes all tabs into one CSV file, distinguished by the ``tab`` column."""
+
+    def __init__(self, output_path):
+        self.file = open(output_path, "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=EXPORT_COLUMNS)
+        self.writer.writeheader()
+
+    def write_rows(self, tab, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class XlsxRowWriter:
+    """Writes one sheet per tab through openpyxl's write-only workbook."""
+
+    def __init__(self, output_path):
+        try:
+            from openpyxl import Workbook
+        except ImportError as e:
+            raise ImportError("Excel export requires openpyxl (pip install openpyxl)") from e
+        self.output_path = output_path
+        self.workbook = Workbook(write_only=True)
+        self.sheet = None
+        self.sheet_tab = None
+        self.sheet_rows = 0
+        self.sheet_count = {}
+
+    def _new_sheet(self, tab):
+        self.sheet_count[tab] = self.sheet_count.get(tab, 0) + 1
+        title = tab if self.sheet_count[tab] == 1 else f"{tab} ({self.sheet_count[tab]})"
+        self.sheet = self.workbook.create_sheet(title)
+        self.sheet.append(EXPORT_COLUMNS[1:])
+        self.sheet_tab = tab
+        self.sheet_rows = 0
+
+    def write_rows(self, tab, rows):
+        for row in rows:
+            if self.sheet_tab != tab or self.sheet_rows >= EXCEL_MAX_ROWS:
+                self._new_sheet(tab)
+            self.sheet.append([row[column] for column in EXPORT_COLUMNS[1:]])
+            self.sheet_rows += 1
+
+    def close(self):
+        self.workbook.save(self.output_path)
+
+
+class ParquetRowWriter:
+    """Writes every chunk of rows as its own Parquet row group."""
+
+    def __init__(self, output_path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)") from e
+        self.pa = pa
+        self.schema = pa.schema([
+            ("tab", pa.string()),
+            ("elr", pa.string()),
+            ("depth", pa.int32()),
+            ("path", pa.string()),
+            ("parent", pa.string()),
+            ("child", pa.string()),
+            ("order", pa.int32()),
+            ("weight", pa.float64()),
+            ("attributes", pa.string()),
+        ])
+        self.writer = pq.ParquetWriter(output_path, self.schema)
+
+    def write_rows(self, tab, rows):
+        self.writer.write_table(self.pa.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+ROW_WRITERS = {
+    "csv": CsvRowWriter,
+    "xlsx": XlsxRowWriter,
+    "parquet": ParquetRowWriter,
+}
+
+
+def export_taxonomy(data, output_path, tabs=None, chunk_size=CHUNK_SIZE, progress=None):
+    """
+    Streams the hierarchies of extracted taxonomy data into a flat file.
+
+    Rows are produced lazily and handed to the writer in chunks, so memory
+    stays bounded by the chunk size rather than by the number of rows.
+
+    :param data: Extracted taxonomy data as returned by ``TaxonomySession.load``.
+    :param output_path: Target file; the format follows the extension
+                        (.csv, .xlsx or .parquet).
+    :param tabs: Tabs to export, all by default.
+    :param chunk_size: Number of rows handed to the writer at a time.
+    :param progress: Optional callback receiving the number of rows written so far.
+    :return: A dictionary with the row count, elapsed seconds and rows per second.
+    """
+    extension = os.path.splitext(output_path)[1].lower()
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {extension or output_path}")
+
+    print(f"\n📤 Exporting to {output_path}")
+    started = time.perf_counter()
+    writer = ROW_WRITERS[EXPORT_FORMATS[extension]](output_path)
+    total_rows = 0
+    try:
+        for tab in tabs or EXPORT_TABS:
+            chunk = []
+            for row in iter_rows(data, tab):
+                chunk.append(row)
+                if len(chunk) >= chunk_size:
+                    writer.write_rows(tab, chunk)
+                    total_rows += len(chunk)
+                    chunk = []
+                    if progress:
+                        progress(total_rows)
+            if chunk:
+                writer.write_rows(tab, chunk)
+                total_rows += len(chunk)
+                if progress:
+                    progress(total_rows)
+    finally:
+        writer.close()
+
+    seconds = time.perf_counter() - started
+    stats = {
+        "rows": total_rows,
+        "seconds": seconds,
+        "rows_per_second": total_rows / seconds if seconds > 0 else float(total_rows),
+    }
+    print(f"✅ Exported {total_rows} rows in {seconds:.2f}s ({stats['rows_per_second']:.0f} rows/s)")
+    return stats
+
+
+def export_in_background(data, output_path, on_done=None, **kwargs):
+    """
+    Runs ``export_taxonomy`` on a worker thread.
+
+    :param on_done: Optional callback receiving ``(stats, error)`` when the export ends.
+    :return: The started thread.
+    """
+    def run():
+        try:
+            stats = export_taxonomy(data, output_path, **kwargs)
+        except Exception as e:
+            print(f"❌ ERROR: Export to {output_path} failed: {e}")
+            if on_done:
+                on_done(None, e)
+            return
+        if on_done:
+            on_done(stats, None)
+
+    thread = threading.Thread(target=run, name=f"export-{os.path.basename(output_path)}")
+    thread.start()
+    return thread
+
+
+def output_names(entry_points):
+    """
+    Names the export file of every entry point after its file name.
+
+    Entry points sharing a file name are told apart by as many of their
+    parent directories as it takes, so no export overwrites another.
+
+    :return: A list of names without extension, one per entry point.
+    """
+    parts = []
+    for entry_point in entry_points:
+        segments = [re.sub(r"[^\w.-]", "_", segment)
+                    for segment in re.split(r"[/\\]+", entry_point) if segment and not segment.endswith(":")]
+        segments[-1] = os.path.splitext(segments[-1])[0]
+        parts.append(segments)
+
+    depths = [1] * len(parts)
+    while True:
+        names = ["_".join(segments[-depth:]) for segments, depth in zip(parts, depths)]
+        duplicates = {name for name in names if names.count(name) > 1}
+        if not duplicates:
+            return names
+        grown = False
+        for index, name in enumerate(names):
+            if name in duplicates and depths[index] < len(parts[index]):
+                depths[index] += 1
+                grown = True
+        if not grown:
+            raise ValueError(f"Entry points would share the export name: {', '.join(sorted(duplicates))}")
+
+
+def main():
+    if len(sys.argv) < 4:
+        print("Usage: python hierarchy_export.py <csv|xlsx|parquet> <output dir> <entry point> [<entry point> ...]")
+        sys.exit(2)
+
+    from taxonomy_session import TaxonomySession
+
+    fmt, output_dir, entry_points = sys.argv[1].lower().lstrip("."), sys.argv[2], sys.argv[3:]
+    if f".{fmt}" not in EXPORT_FORMATS:
+        print(f"❌ ERROR: Unsupported export format: {fmt}")
+        sys.exit(2)
+    try:
+        names = output_names(entry_points)
+    except ValueError as e:
+        print(f"❌ ERROR: {e}")
+        sys.exit(2)
+    os.makedirs(output_dir, exist_ok=True)
+
+    failures = []
+    export_thread = None
+
+    def record_failure(stats, error):
+        if error:
+            failures.append(error)
+
+    session = TaxonomySession(mirror_dir=os.environ.get("XBRL_MIRROR_DIR"), low_memory=True)
+    try:
+        # Each export runs while the next entry point is being loaded. At most one
+        # export is in flight and the session forgets every entry point it has
+        # handed over, so memory stays at one loaded and one exporting taxonomy.
+        for entry_point, name in zip(entry_points, names):
+            data = session.load(entry_point)
+            session.discard(entry_point)
+            if export_thread is not None:
+                export_thread.join()
+            output_path = os.path.join(output_dir, f"{name}.{fmt}")
+            export_thread = export_in_background(data, output_path, record_failure)
+            del data
+        if export_thread is not None:
+            export_thread.join()
+    finally:
+        session.close()
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,50 +1,89 @@
-# Compatibility Patch for imp in Python 3.12+
-try:
-    import imp
-except ImportError:
-    import importlib.util
-
-    class imp:
-        @staticmethod
-        def find_module(name, path=None):
-            spec = importlib.util.find_spec(name, path)
-            if spec is None:
-                raise ImportError(f"No module named {name}")
-            return None, spec.origin, ("", "", None)
-
-        @staticmethod
-        def load_module(name, file, pathname, description):
-            spec = importlib.util.spec_from_file_location(name, pathname)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            return module
-
-# Force inject the patched `imp` module into `sys.modules`
-import sys
-sys.modules["imp"] = imp
-
-# Compatibility Patch for collections.abc in Python 3.10+
-import collections
-if not hasattr(collections, "MutableSet"):
-    from collections.abc import MutableSet
-    collections.MutableSet = MutableSet
-
-if not hasattr(collections, "MutableMapping"):
-    from collections.abc import MutableMapping
-    collections.MutableMapping = MutableMapping
+# Compatibility patches for arelle on newer Python versions
+import arelle_compat
 
 # Import GUI and taxonomy processing dependencies
+import os
+import sys
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QTreeWidget, QTreeWidgetItem,
     QPushButton, QLineEdit, QLabel, QTabWidget, QWidget, QFileDialog, QHBoxLayout,
-    QStatusBar
+    QStatusBar, QCheckBox, QListWidget, QTableView, QHeaderView, QSplitter
 )
-from arelle.Cntlr import Cntlr
-from concept_parser import parse_concepts
-from dimension_parser import parse_dimensions
-from presentation_parser import parse_presentation
-from formula_parser import parse_formulas
-from calculation_parser import parse_calculations  
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QAbstractTableModel, QModelIndex
+from taxonomy_session import TaxonomySession
+from memory_usage import format_bytes
+from hierarchy_export import export_taxonomy
+
+
+class TableLayoutModel(QAbstractTableModel):
+    """
+    Presents a resolved table layout as a grid without materialising its cells.
+
+    The top ``column_levels`` rows hold the column headers and the left
+    ``row_levels`` columns the row headers; cell text is derived on demand
+    from the leaf paths, so only visible cells are ever computed.
+    """
+
+    def __init__(self, layout, parent=None):
+        super().__init__(parent)
+        self.layout = layout
+        self.x_leaves = layout["x"]
+        self.y_leaves = layout["y"]
+        self.column_levels = layout["column_levels"]
+        self.row_levels = layout["row_levels"]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.column_levels + max(len(self.y_leaves), 1)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.row_levels + max(len(self.x_leaves), 1)
+
+    @staticmethod
+    def header_text(leaves, index, level):
+        """Returns a header label only where it starts, leaving repeats blank."""
+        if index >= len(leaves) or level >= len(leaves[index]):
+            return ""
+        path = leaves[index]
+        if index > 0 and leaves[index - 1][:level + 1] == path[:level + 1]:
+            return ""
+        return path[level]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if row < self.column_levels and column < self.row_levels:
+            if row == 0 and column == 0 and self.layout["z"]:
+                return f"Z: {' / '.join(self.layout['z'][0])}"
+            return ""
+        if row < self.column_levels:
+            return self.header_text(self.x_leaves, column - self.row_levels, row)
+        if column < self.row_levels:
+            return self.header_text(self.y_leaves, row - self.column_levels, column)
+        return ""
+
+
+class ExportWorker(QThread):
+    """Runs a hierarchy export off the GUI thread."""
+    progress = pyqtSignal(int)
+    done = pyqtSignal(str)
+
+    def __init__(self, data, output_path, parent=None):
+        super().__init__(parent)
+        self.data = data
+        self.output_path = output_path
+
+    def run(self):
+        try:
+            stats = export_taxonomy(self.data, self.output_path, progress=self.progress.emit)
+            self.done.emit(
+                f"Exported {stats['rows']} rows to {self.output_path} "
+                f"in {stats['seconds']:.1f}s ({stats['rows_per_second']:.0f} rows/s)."
+            )
+        except Exception as e:
+            print(f"❌ ERROR: {e}")
+            self.done.emit(f"Error exporting taxonomy: {e}")
+
 
 class TaxonomyViewer(QMainWindow):
     def __init__(self):
@@ -52,6 +91,8 @@ class TaxonomyViewer(QMainWindow):
         self.setWindowTitle("XBRL Taxonomy Viewer")
         self.setGeometry(100, 100, 1400, 850)
         self.setStatusBar(QStatusBar())
+        self.taxonomy_data = None
+        self.export_worker = None
 
         # Main layout
         main_layout = QVBoxLayout()
@@ -62,7 +103,7 @@ class TaxonomyViewer(QMainWindow):
         # File loader section
         file_loader_layout = QHBoxLayout()
         self.file_path_input = QLineEdit()
-        self.file_path_input.setPlaceholderText("Enter path to taxonomy file...")
+        self.file_path_input.setPlaceholderText("Enter path to taxonomy file (separate several with ';')...")
         file_loader_layout.addWidget(QLabel("Taxonomy File:"))
         file_loader_layout.addWidget(self.file_path_input)
 
@@ -70,10 +111,18 @@ class TaxonomyViewer(QMainWindow):
         browse_button.clicked.connect(self.browse_file)
         file_loader_layout.addWidget(browse_button)
 
+        self.low_memory_checkbox = QCheckBox("Low memory")
+        self.low_memory_checkbox.setToolTip("Extract compact data and close the arelle model before building the tabs")
+        file_loader_layout.addWidget(self.low_memory_checkbox)
+
         load_button = QPushButton("Load")
         load_button.clicked.connect(self.load_taxonomy)
         file_loader_layout.addWidget(load_button)
 
+        self.export_button = QPushButton("Export")
+        self.export_button.clicked.connect(self.export_hierarchies)
+        file_loader_layout.addWidget(self.export_button)
+
         main_layout.addLayout(file_loader_layout)
 
         # Tabs for different data views
@@ -83,18 +132,24 @@ class TaxonomyViewer(QMainWindow):
         self.tab_presentation = QTreeWidget()
         self.tab_formulas = QTreeWidget()
         self.tab_calculations = QTreeWidget()
+        self.tab_compare = QTreeWidget()
+        self.tab_tables = QSplitter()
 
         self.setup_concepts_tab(self.tab_concepts)
         self.setup_dimensions_tab(self.tab_dimensions)
         self.setup_presentation_tab(self.tab_presentation)
         self.setup_formula_tab(self.tab_formulas)
         self.setup_calculation_tab(self.tab_calculations)
+        self.setup_compare_tab(self.tab_compare, [])
+        self.setup_tables_tab(self.tab_tables)
 
         self.tabs.addTab(self.tab_concepts, "Concepts")
         self.tabs.addTab(self.tab_dimensions, "Dimensions")
         self.tabs.addTab(self.tab_presentation, "Presentation")
         self.tabs.addTab(self.tab_formulas, "Formulas")
         self.tabs.addTab(self.tab_calculations, "Calculation Relationships")
+        self.tabs.addTab(self.tab_compare, "Compare Entry Points")
+        self.tabs.addTab(self.tab_tables, "Tables")
         main_layout.addWidget(self.tabs)
 
     def setup_concepts_tab(self, tab):
@@ -124,31 +179,57 @@ class TaxonomyViewer(QMainWindow):
         tab.setColumnCount(3)
         tab.setHeaderLabels(["QName", "Weight", "Balance"])
 
+    def setup_compare_tab(self, tab, names):
+        """Configure the Compare tab with one column per loaded entry point."""
+        tab.setColumnCount(1 + len(names))
+        tab.setHeaderLabels(["QName"] + names)
+
+    def setup_tables_tab(self, tab):
+        """Configure the Tables tab: a table list beside a virtualized grid."""
+        self.tables = {}
+        self.table_models = {}
+        self.table_list = QListWidget()
+        self.table_list.currentTextChanged.connect(self.show_table)
+
+        self.table_view = QTableView()
+        for header in (self.table_view.horizontalHeader(), self.table_view.verticalHeader()):
+            # Fixed sections keep Qt from measuring every row and column up front
+            header.setSectionResizeMode(QHeaderView.Fixed)
+        self.table_view.horizontalHeader().setDefaultSectionSize(160)
+        self.table_view.verticalHeader().setDefaultSectionSize(22)
+
+        tab.addWidget(self.table_list)
+        tab.addWidget(self.table_view)
+        tab.setStretchFactor(1, 1)
+
     def browse_file(self):
-        """Open a file dialog to select a taxonomy file."""
-        file_path, _ = QFileDialog.getOpenFileName(self, "Select Taxonomy File", "", "XBRL Files (*.xsd)")
-        if file_path:
-            self.file_path_input.setText(file_path)
+        """Open a file dialog to select one or more taxonomy files."""
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Select Taxonomy Files", "", "XBRL Files (*.xsd)")
+        if file_paths:
+            self.file_path_input.setText(";".join(file_paths))
 
     def load_taxonomy(self):
-        """Load the taxonomy file and populate the GUI tabs."""
-        file_path = self.file_path_input.text()
-        if not file_path:
+        """Load the taxonomy files and populate the GUI tabs."""
+        file_paths = [path.strip() for path in self.file_path_input.text().split(";") if path.strip()]
+        if not file_paths:
             self.statusBar().showMessage("Please specify a taxonomy file path.", 5000)
             return
 
+        session = TaxonomySession(
+            mirror_dir=os.environ.get("XBRL_MIRROR_DIR"),
+            low_memory=self.low_memory_checkbox.isChecked()
+        )
         try:
-            cntlr = Cntlr()
-            model_xbrl = cntlr.modelManager.load(file_path)
-            if not model_xbrl:
-                raise Exception(f"Failed to load taxonomy: {file_path}")
-
-            # Call separate parsers
-            concepts = parse_concepts(model_xbrl)
-            dimensions = parse_dimensions(model_xbrl)
-            presentation = parse_presentation(model_xbrl)
-            formulas = parse_formulas(model_xbrl)  # ✅ Debug This Step
-            calculations = parse_calculations(model_xbrl)
+            # Entry points share one controller and one copy of their common sub-trees
+            for file_path in file_paths:
+                data = session.load(file_path)
+
+            # The detail tabs show the last entry point
+            concepts = data["concepts"]
+            dimensions = data["dimensions"]
+            presentation = data["presentation"]
+            formulas = data["formulas"]
+            calculations = data["calculations"]
 
             # ✅ Debugging Output for Formulas
             # print("\n✅ DEBUG: Raw Output from parse_formulas():")
@@ -164,15 +245,46 @@ class TaxonomyViewer(QMainWindow):
             self.populate_hierarchical(self.tab_presentation, presentation)
             self.populate_formulas(self.tab_formulas, formulas)  # ✅ Ensure formulas is valid
             self.populate_calculations(self.tab_calculations, calculations)
+            self.populate_compare(self.tab_compare, session.names(), session.compare_concepts())
+            self.populate_tables(data.get("tables"))
+            self.taxonomy_data = data
 
-            model_xbrl.close()
-            self.statusBar().showMessage("Taxonomy loaded successfully.", 5000)
+            self.statusBar().showMessage(
+                f"Loaded {len(file_paths)} taxonomy entry point(s) successfully. "
+                f"Peak RSS ({session.memory.get('peak_scope')}) {format_bytes(session.memory.get('peak_rss'))}, "
+                f"after extraction {format_bytes(session.memory.get('steady_rss'))}.", 10000
+            )
 
         except Exception as e:
             self.statusBar().showMessage(f"Error loading taxonomy: {e}", 5000)
             print(f"❌ ERROR: {e}")
 
+        finally:
+            session.close()
+
+
 
+    def export_hierarchies(self):
+        """Export every tab of the loaded taxonomy as flat rows in the background."""
+        if self.taxonomy_data is None:
+            self.statusBar().showMessage("Load a taxonomy before exporting.", 5000)
+            return
+        if self.export_worker is not None and self.export_worker.isRunning():
+            self.statusBar().showMessage("An export is already running.", 5000)
+            return
+
+        output_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Hierarchies", "", "CSV Files (*.csv);;Excel Files (*.xlsx);;Parquet Files (*.parquet)"
+        )
+        if not output_path:
+            return
+
+        self.export_worker = ExportWorker(self.taxonomy_data, output_path, self)
+        self.export_worker.progress.connect(
+            lambda rows: self.statusBar().showMessage(f"Exporting... {rows} rows written")
+        )
+        self.export_worker.done.connect(lambda message: self.statusBar().showMessage(message, 10000))
+        self.export_worker.start()
 
     def populate_concepts(self, tree, concepts):
         """Populate the Concepts tab."""
@@ -322,6 +434,51 @@ class TaxonomyViewer(QMainWindow):
                     add_items(parent_node, {child_name: child_details})
 
 
+    def populate_compare(self, tree, names, comparison):
+        """Populate the Compare tab with concept presence per entry point."""
+        tree.clear()
+        self.setup_compare_tab(tree, names)
+
+        if not comparison:
+            QTreeWidgetItem(tree, ["No concepts found"])
+            return
+
+        shared_item = QTreeWidgetItem(tree, ["Shared by all entry points"])
+        specific_item = QTreeWidgetItem(tree, ["Not in every entry point"])
+        for qname, present in comparison.items():
+            parent_item = shared_item if all(present) else specific_item
+            QTreeWidgetItem(parent_item, [qname] + ["✓" if flag else "" for flag in present])
+
+        shared_item.setText(0, f"Shared by all entry points ({shared_item.childCount()})")
+        specific_item.setText(0, f"Not in every entry point ({specific_item.childCount()})")
+        specific_item.setExpanded(True)
+
+    def populate_tables(self, tables):
+        """Populate the Tables tab with the resolved table layouts."""
+        self.table_view.setModel(None)
+        self.table_models.clear()
+        self.table_list.clear()
+        self.tables = tables or {}
+
+        if not self.tables:
+            self.table_list.addItem("No tables found")
+            return
+        self.table_list.addItems(list(self.tables))
+
+    def show_table(self, label):
+        """Show one table in the grid, building its model on first use only."""
+        layout = self.tables.get(label)
+        if layout is None:
+            self.table_view.setModel(None)
+            return
+        if label not in self.table_models:
+            # No Qt parent: the models are freed with self.table_models on the next load
+            self.table_models[label] = TableLayoutModel(layout)
+        self.table_view.setModel(self.table_models[label])
+        self.statusBar().showMessage(
+            f"{label}: {len(layout['y'])} rows x {len(layout['x'])} columns, {len(layout['z'])} z-slices", 5000
+        )
+
 
 def main():
     app = QApplication(sys.argv)
@@ -0,0 +1,253 @@
+from collections import OrderedDict
+
+# Table linkbase arcroles of the 2014 recommendation and the 2013 draft still used by EBA/EIOPA
+TABLE_BREAKDOWN_ARCROLES = [
+    "http://xbrl.org/arcrole/2014/table-breakdown",
+    "http://xbrl.org/arcrole/PWD/2013-05-17/table-breakdown",
+]
+BREAKDOWN_TREE_ARCROLES = [
+    "http://xbrl.org/arcrole/2014/breakdown-tree",
+    "http://xbrl.org/arcrole/PWD/2013-05-17/breakdown-tree",
+]
+DEFINITION_NODE_SUBTREE_ARCROLES = [
+    "http://xbrl.org/arcrole/2014/definition-node-subtree",
+    "http://xbrl.org/arcrole/PWD/2013-05-17/definition-node-subtree",
+]
+
+AXES = ("x", "y", "z")
+ASPECT_ELEMENTS = ("dimensionAspect", "conceptAspect", "entityIdentifierAspect", "periodAspect", "unitAspect")
+
+
+def get_generic_label(node):
+    """ Returns the generic label of a table object, or None if it has none """
+    if hasattr(node, "genLabel"):
+        try:
+            return node.genLabel() or None
+        except (TypeError, AttributeError):
+            return None
+    return None
+
+
+def get_node_label(node):
+    """ Returns the generic label of a table object, falling back to its xlink label """
+    return get_generic_label(node) or getattr(node, "xlinkLabel", None) or node.localName
+
+
+def get_node_settings(node):
+    """ Collects the text of a definition node's child elements by local name """
+    settings = {}
+    for child in node.iterchildren():
+        local_name = getattr(child, "localName", None)
+        text = (child.text or "").strip()
+        if local_name:
+            settings.setdefault(local_name, []).append(text)
+    return settings
+
+
+def local_name(qname_text):
+    return qname_text.split(":")[-1]
+
+
+def build_member_lookup(dimensions):
+    """
+    Indexes the dimension parser output by ELR and element local name.
+
+    The dimension parser keeps every arcrole and ELR as a separate tree whose
+    root is prefixed with ``[elr] ``; merging the trees of one ELR lets a
+    dimension be followed through its domain down to its members.
+
+    :param dimensions: The output of ``parse_dimensions``.
+    :return: A dictionary mapping the last segment of each ELR, and None for
+             all ELRs together, to a dictionary of local name to ordered
+             child names.
+    """
+    lookup = OrderedDict()
+
+    def add_node(children_by_name, name, node):
+        children = children_by_name.setdefault(name, [])
+        for child in node.get("children", []):
+            if child["name"] not in children:
+                children.append(child["name"])
+            add_node(children_by_name, child["name"], child)
+
+    for root_name, root in (dimensions or {}).items():
+        elr, _, name = root_name[1:].partition("] ") if root_name.startswith("[") else ("", "", root_name)
+        for key in (elr, None):
+            add_node(lookup.setdefault(key, OrderedDict()), name, root)
+    return lookup
+
+
+def get_relationship_members(sources, children_by_name, include_self, generations):
+    """
+    Lists the members a dimension relationship node selects as (depth, name) pairs in tree order.
+
+    :param sources: Local names of the relationship sources.
+    :param children_by_name: Child names by local name for the node's linkrole.
+    :param include_self: Whether the sources themselves are selected.
+    :param generations: Number of generations below each source, 0 for all.
+    """
+    members = []
+    for source in sources:
+        visited = {source}
+        offset = 0 if include_self else 1
+        if include_self:
+            members.append((0, source))
+        stack = [(1, name) for name in reversed(children_by_name.get(source, []))]
+        while stack:
+            generation, name = stack.pop()
+            if name in visited:
+                continue
+            visited.add(name)
+            members.append((generation - offset, name))
+            if not generations or generation < generations:
+                stack.extend((generation + 1, child) for child in reversed(children_by_name.get(name, [])))
+    return members
+
+
+def resolve_dimension_relationship_node(node, member_lookup):
+    """
+    Resolves a dimension relationship node into header labels.
+
+    The members start at the node's relationshipSource (or below the dimension
+    itself when there is none), stay within its linkrole, and follow its
+    formulaAxis and generations.
+    """
+    settings = get_node_settings(node)
+    dimension = local_name(settings.get("dimension", [""])[0]) or None
+    linkrole = settings.get("linkrole", [""])[0]
+    formula_axis = settings.get("formulaAxis", [""])[0] or "descendant-or-self"
+    try:
+        generations = int(settings.get("generations", ["0"])[0] or 0)
+    except ValueError:
+        generations = 0
+
+    include_self = formula_axis.endswith("-or-self")
+    if formula_axis.startswith("child"):
+        generations = 1
+
+    sources = [local_name(source) for source in settings.get("relationshipSource", []) if source]
+    if not sources and dimension:
+        # The dimension is not a member itself, so only what lies below it is selected
+        sources, include_self = [dimension], False
+
+    children_by_name = member_lookup.get(linkrole.split("/")[-1] if linkrole else None, {})
+    members = get_relationship_members(sources, children_by_name, include_self, generations)
+    return ["  " * depth + member for depth, member in members]
+
+
+def get_open_aspect_label(node):
+    """ Labels an aspect node, which stays a single open header rather than a list of members """
+    label = get_generic_label(node)
+    if not label:
+        settings = get_node_settings(node)
+        for aspect in ASPECT_ELEMENTS:
+            if aspect in settings:
+                label = local_name(settings[aspect][0]) if aspect == "dimensionAspect" else aspect[0].upper() + aspect[1:-len("Aspect")]
+                break
+    return f"{label or node.localName} (open)"
+
+
+def resolve_axis_leaves(breakdowns, tree_sets, subtree_sets, member_lookup):
+    """
+    Resolves the breakdowns on one axis into header paths, one per leaf.
+
+    Each path is the tuple of header labels from the outermost breakdown
+    down to the leaf, so the grid can derive every header level from it.
+    Nodes already on the current branch are skipped, so a cyclic subtree in
+    a faulty linkbase cannot recurse forever.
+    """
+    leaves = [()]
+    for breakdown in breakdowns:
+        breakdown_leaves = []
+        ancestors = set()
+
+        def visit(node, path):
+            if node in ancestors:
+                print(f"⚠️ Cycle detected! Skipping {get_node_label(node)}")
+                return
+            children = [
+                rel.toModelObject
+                for relationship_set in subtree_sets
+                for rel in relationship_set.fromModelObject(node)
+                if rel.toModelObject is not None
+            ]
+
+            if node.localName == "aspectNode":
+                breakdown_leaves.append(path + (get_open_aspect_label(node),))
+                return
+
+            if node.localName == "dimensionRelationshipNode":
+                members = resolve_dimension_relationship_node(node, member_lookup)
+                breakdown_leaves.extend(path + (member,) for member in members)
+                if not members:
+                    breakdown_leaves.append(path + (get_node_label(node),))
+                return
+
+            node_path = path + (get_node_label(node),)
+            if not getattr(node, "isAbstract", False):
+                breakdown_leaves.append(node_path)
+            ancestors.add(node)
+            for child in children:
+                visit(child, node_path)
+            ancestors.remove(node)
+
+        for tree_set in tree_sets:
+            for rel in tree_set.fromModelObject(breakdown):
+                if rel.toModelObject is not None:
+                    visit(rel.toModelObject, ())
+
+        if breakdown_leaves:
+            leaves = [outer + inner for outer in leaves for inner in breakdown_leaves]
+
+    return [] if leaves == [()] else leaves
+
+
+def parse_tables(model_xbrl, dimensions=None):
+    """
+    Extracts table linkbase tables and resolves their header layouts once.
+
+    :param model_xbrl: The loaded XBRL model.
+    :param dimensions: The output of ``parse_dimensions``, used to expand
+                       dimension relationship nodes into their members.
+    :return: An ordered dictionary of table label to its resolved layout:
+             the x, y and z leaf header paths and the number of header levels.
+    """
+    print("\nExtracting Table Linkbase Tables...")
+    tables = OrderedDict()
+    member_lookup = build_member_lookup(dimensions)
+
+    tree_sets = [rs for rs in (model_xbrl.relationshipSet(a) for a in BREAKDOWN_TREE_ARCROLES) if rs]
+    subtree_sets = [rs for rs in (model_xbrl.relationshipSet(a) for a in DEFINITION_NODE_SUBTREE_ARCROLES) if rs]
+
+    for arcrole in TABLE_BREAKDOWN_ARCROLES:
+        relationship_set = model_xbrl.relationshipSet(arcrole)
+        if not relationship_set or not relationship_set.modelRelationships:
+            continue
+
+        table_nodes = OrderedDict()
+        for rel in relationship_set.modelRelationships:
+            if rel.fromModelObject is not None:
+                table_nodes.setdefault(rel.fromModelObject, None)
+
+        for table_node in table_nodes:
+            breakdowns = {axis: [] for axis in AXES}
+            for rel in relationship_set.fromModelObject(table_node):
+                if rel.toModelObject is None:
+                    continue
+                axis = rel.arcElement.get("axis") or rel.arcElement.get("axisDisposition") or "z"
+                breakdowns.setdefault(axis, []).append(rel.toModelObject)
+
+            layout = {
+                axis: resolve_axis_leaves(breakdowns[axis], tree_sets, subtree_sets, member_lookup)
+                for axis in AXES
+            }
+            layout["column_levels"] = max((len(path) for path in layout["x"]), default=0)
+            layout["row_levels"] = max((len(path) for path in layout["y"]), default=0)
+
+            label = get_node_label(table_node)
+            if label in tables:
+                label = f"{label} ({getattr(table_node, 'id', None) or id(table_node)})"
+            tables[label] = layout
+
+    print(f"Extracted {len(tables)} tables.")
+    return tables
@@ -0,0 +1,333 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urljoin, urldefrag, urlparse
+from urllib.request import urlopen, url2pathname, pathname2url
+from xml.etree import ElementTree
+
+XSD_NS = "http://www.w3.org/2001/XMLSchema"
+LINK_NS = "http://www.xbrl.org/2003/linkbase"
+XLINK_HREF = "{http://www.w3.org/1999/xlink}href"
+XSI_SCHEMA_LOCATION = "{http://www.w3.org/2001/XMLSchema-instance}schemaLocation"
+TYPED_DOMAIN_REF = "{http://xbrl.org/2005/xbrldt}typedDomainRef"
+
+# Elements whose attribute points at another document of the DTS
+REFERENCE_ATTRIBUTES = {
+    f"{{{XSD_NS}}}import": "schemaLocation",
+    f"{{{XSD_NS}}}include": "schemaLocation",
+    f"{{{LINK_NS}}}linkbaseRef": XLINK_HREF,
+    f"{{{LINK_NS}}}roleRef": XLINK_HREF,
+    f"{{{LINK_NS}}}arcroleRef": XLINK_HREF,
+    f"{{{LINK_NS}}}loc": XLINK_HREF,
+}
+
+
+def is_remote(url):
+    """Returns True for URLs that have to be fetched over the network."""
+    return urlparse(url).scheme in ("http", "https")
+
+
+def to_url(path_or_url):
+    """Turns a local path into a file URL and leaves URLs untouched."""
+    if urlparse(path_or_url).scheme in ("http", "https", "file"):
+        return path_or_url
+    return urljoin("file:", pathname2url(os.path.abspath(path_or_url)))
+
+
+def find_references(content, base_url):
+    """
+    Lists the documents a schema or linkbase refers to.
+
+    :param content: The raw bytes of the document.
+    :param base_url: The URL the document was retrieved from.
+    :return: An ordered list of absolute URLs without fragments.
+    """
+    references = []
+    seen = set()
+    try:
+        root = ElementTree.fromstring(content)
+    except ElementTree.ParseError as e:
+        print(f"⚠️ Could not parse {base_url}: {e}")
+        return references
+
+    for element in root.iter():
+        hrefs = []
+        attribute = REFERENCE_ATTRIBUTES.get(element.tag)
+        if attribute and element.get(attribute):
+            hrefs.append(element.get(attribute))
+        # Typed dimensions point at the schema of their domain element
+        if element.get(TYPED_DOMAIN_REF):
+            hrefs.append(element.get(TYPED_DOMAIN_REF))
+        # xsi:schemaLocation holds namespace/location pairs; arelle loads the locations
+        if element.get(XSI_SCHEMA_LOCATION):
+            hrefs.extend(element.get(XSI_SCHEMA_LOCATION).split()[1::2])
+
+        for href in hrefs:
+            url = urldefrag(urljoin(base_url, href.strip()))[0]
+            if url and url not in seen:
+                seen.add(url)
+                references.append(url)
+    return references
+
+
+class TaxonomyMirror:
+    """
+    A local, content-addressed store of remote taxonomy documents.
+
+    Documents are kept under ``objects/`` named by the SHA-256 of their
+    content, and ``index.json`` maps each source URL to its digest.
+    ``complete.json`` records the entry points whose whole reference graph
+    was mirrored, together with the digests of their local documents.
+    """
+
+    def __init__(self, mirror_dir):
+        self.mirror_dir = mirror_dir
+        self.objects_dir = os.path.join(mirror_dir, "objects")
+        self.index_path = os.path.join(mirror_dir, "index.json")
+        self.complete_path = os.path.join(mirror_dir, "complete.json")
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self.index = self._read_json(self.index_path)
+        self.complete = self._read_json(self.complete_path)
+
+    @staticmethod
+    def _read_json(path):
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_json(path, data):
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(temp_path, path)
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def path_for(self, url):
+        """Returns the mirrored file for ``url``, or None if it is not mirrored."""
+        digest = self.index.get(url)
+        if digest is None:
+            return None
+        path = self.object_path(digest)
+        return path if os.path.exists(path) else None
+
+    def write_object(self, content):
+        """Stores ``content`` and returns its digest. Safe to call from worker threads."""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.{id(content)}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        return digest
+
+    def is_complete(self, entry_url):
+        """
+        Tells whether the graph of ``entry_url`` is fully mirrored and none of
+        its local documents changed since, which only needs a hash per local
+        file instead of a parse of the whole DTS.
+        """
+        graph = self.complete.get(entry_url)
+        if graph is None:
+            return False
+        for url, digest in graph["local"].items():
+            try:
+                with open(url2pathname(urlparse(url).path), "rb") as f:
+                    if hashlib.sha256(f.read()).hexdigest() != digest:
+                        return False
+            except OSError:
+                return False
+        return all(self.path_for(url) for url in graph["remote"])
+
+    def save(self):
+        self._write_json(self.index_path, self.index)
+        self._write_json(self.complete_path, self.complete)
+
+
+def fetch_document(url, mirror, refresh=False, timeout=30):
+    """
+    Retrieves one document, from the mirror when possible.
+
+    :return: A tuple of (content, digest, timing) where timing describes
+             how the document was obtained.
+    """
+    started = time.perf_counter()
+    timing = {"url": url, "status": "", "bytes": 0, "seconds": 0.0}
+    content = digest = None
+
+    try:
+        if not is_remote(url):
+            with open(url2pathname(urlparse(url).path), "rb") as f:
+                content = f.read()
+            digest = hashlib.sha256(content).hexdigest()
+            timing["status"] = "local"
+        elif not refresh and mirror.path_for(url):
+            with open(mirror.object_path(mirror.index[url]), "rb") as f:
+                content = f.read()
+            digest = mirror.index[url]
+            timing["status"] = "mirrored"
+        else:
+            with urlopen(url, timeout=timeout) as response:
+                content = response.read()
+            digest = mirror.write_object(content)
+            timing["status"] = "fetched"
+        timing["bytes"] = len(content)
+    except (OSError, ValueError) as e:
+        timing["status"] = f"failed: {e}"
+
+    timing["seconds"] = time.perf_counter() - started
+    return content, digest, timing
+
+
+def prefetch(entry_point, mirror_dir, max_workers=8, refresh=False, timeout=30):
+    """
+    Fetches the reference graph of an entry point breadth-first into a mirror.
+
+    Local documents are read in place and only followed for their references;
+    remote documents are downloaded concurrently by a bounded thread pool.
+    When the mirror already holds the entry point's complete graph and its
+    local documents are unchanged, nothing is parsed or fetched and the
+    report is marked ``up_to_date``.
+
+    :param entry_point: Path or URL of the taxonomy entry point.
+    :param mirror_dir: Directory of the content-addressed mirror.
+    :param max_workers: Maximum number of concurrent downloads.
+    :param refresh: Walk the graph and download remote documents even if they are mirrored.
+    :param timeout: Socket timeout in seconds for each download.
+    :return: A report with the per-document timings and summary counts.
+    """
+    print(f"\n🌐 Prefetching {entry_point} into {mirror_dir}")
+    started = time.perf_counter()
+    mirror = TaxonomyMirror(mirror_dir)
+    timings = []
+    local_digests = {}
+
+    entry_url = to_url(entry_point)
+    up_to_date = not refresh and mirror.is_complete(entry_url)
+    seen = {entry_url}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = set() if up_to_date else {pool.submit(fetch_document, entry_url, mirror, refresh, timeout)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                content, digest, timing = future.result()
+                timings.append(timing)
+                if content is None:
+                    print(f"⚠️ {timing['url']}: {timing['status']}")
+                    continue
+                if timing["status"] == "local":
+                    local_digests[timing["url"]] = digest
+                else:
+                    mirror.index[timing["url"]] = digest
+
+                for url in find_references(content, timing["url"]):
+                    if url not in seen:
+                        seen.add(url)
+                        pending.add(pool.submit(fetch_document, url, mirror, refresh, timeout))
+
+    report = {
+        "entry_point": entry_point,
+        "documents": timings,
+        "up_to_date": up_to_date,
+        "seconds": time.perf_counter() - started,
+    }
+    for status in ("local", "mirrored", "fetched"):
+        report[status] = sum(1 for t in timings if t["status"] == status)
+    report["failed"] = len(timings) - report["local"] - report["mirrored"] - report["fetched"]
+
+    if up_to_date:
+        print(f"✅ Mirror already holds the complete graph of {entry_point}")
+        return report
+
+    if report["failed"]:
+        mirror.complete.pop(entry_url, None)
+    else:
+        mirror.complete[entry_url] = {
+            "local": local_digests,
+            "remote": sorted(t["url"] for t in timings if t["status"] != "local"),
+        }
+    mirror.save()
+
+    print(f"✅ Prefetched {len(timings)} documents in {report['seconds']:.2f}s "
+          f"({report['fetched']} fetched, {report['mirrored']} mirrored, "
+          f"{report['local']} local, {report['failed']} failed)")
+    return report
+
+
+def is_cached(target, source, digest):
+    """Tells whether the cache file ``target`` already holds the mirror object ``source``."""
+    try:
+        if os.path.samefile(target, source):
+            return True
+        if os.path.getsize(target) != os.path.getsize(source):
+            return False
+        with open(target, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest() == digest
+    except OSError:
+        return False
+
+
+def install_mirror(cntlr, mirror_dir, work_offline=True):
+    """
+    Makes an arelle controller resolve mirrored documents from the mirror.
+
+    Every mirrored document is linked into the controller's web cache,
+    replacing cached copies whose content differs from the mirror. With
+    ``work_offline`` the cache is also switched to offline mode, so loads
+    never touch the network; leave it off when the mirror is incomplete.
+
+    :param cntlr: The arelle controller whose web cache is populated.
+    :param mirror_dir: Directory of the content-addressed mirror.
+    :param work_offline: Switch the web cache to offline mode.
+    :return: The number of documents made available.
+    """
+    mirror = TaxonomyMirror(mirror_dir)
+    installed = 0
+    for url in mirror.index:
+        source = mirror.path_for(url)
+        if source is None:
+            continue
+        target = cntlr.webCache.urlToCacheFilepath(url)
+        if not is_cached(target, source, mirror.index[url]):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # Build the new file next to the target and swap it in, replacing a stale copy
+            temp_path = f"{target}.{os.getpid()}.tmp"
+            try:
+                os.link(source, temp_path)
+            except OSError:
+                shutil.copyfile(source, temp_path)
+            os.replace(temp_path, target)
+        installed += 1
+
+    cntlr.webCache.workOffline = work_offline
+    if work_offline:
+        print(f"📴 Working offline with {installed} mirrored documents")
+    else:
+        print(f"🌐 {installed} mirrored documents installed, missing ones are fetched online")
+    return installed
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: python taxonomy_prefetch.py <entry point> <mirror dir> [max workers]")
+        sys.exit(2)
+
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    report = prefetch(sys.argv[1], sys.argv[2], max_workers=max_workers)
+    for timing in sorted(report["documents"], key=lambda t: -t["seconds"]):
+        print(f"{timing['seconds']:8.3f}s {timing['bytes']:>10} {timing['status']:<10} {timing['url']}")
+    sys.exit(1 if report["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+# Compatibility patches for arelle on newer Python versions
+import arelle_compat
+
+import os
+from collections import OrderedDict
+
+from arelle.Cntlr import Cntlr
+from concept_parser import parse_concepts
+from dimension_parser import parse_dimensions
+from presentation_parser import parse_presentation
+from formula_parser import parse_formulas
+from calculation_parser import parse_calculations
+from table_parser import parse_tables
+from taxonomy_prefetch import prefetch, install_mirror
+from memory_usage import current_rss, peak_rss, reset_peak_rss, release_free_memory, format_bytes
+
+PARSERS = OrderedDict([
+    ("concepts", parse_concepts),
+    ("dimensions", parse_dimensions),
+    ("presentation", parse_presentation),
+    ("formulas", parse_formulas),
+    ("calculations", parse_calculations),
+])
+
+
+def extract_taxonomy(model_xbrl, compact=False, previous=()):
+    """
+    Runs every parser against a loaded XBRL model.
+
+    :param model_xbrl: The loaded XBRL model.
+    :param compact: Compact each parser's output in place with ``compact_tree``
+                    as soon as it is produced, so the ordered dictionaries it
+                    replaces are freed before the next parser runs.
+    :param previous: Extracted data of entry points loaded earlier; sub-trees
+                     equal to theirs are replaced by their instances.
+    :return: A dictionary with the output of each parser, keyed by tab.
+    """
+    data = {}
+    for name, parser in PARSERS.items():
+        output = parser(model_xbrl)
+        if compact:
+            output = compact_tree(output)
+        data[name] = share_subtrees(output, [p.get(name) for p in previous])
+
+    # Table layouts expand dimension relationship nodes with the members found by the dimension parser
+    tables = parse_tables(model_xbrl, data["dimensions"])
+    if compact:
+        tables = compact_tree(tables)
+    data["tables"] = share_subtrees(tables, [p.get("tables") for p in previous])
+    return data
+
+
+def compact_tree(value):
+    """
+    Compacts parser output in place.
+
+    Ordered dictionaries are replaced by plain ones and empty ``children``
+    entries are dropped, so consumers must read
+    children with ``.get``. Containers are rewritten node by node rather than
+    copied as a whole, so compacting adds no more than one node to the peak.
+    The savings come from the ``OrderedDict`` nodes and empty children of the
+    calculation, dimension and formula trees; trees that are already plain
+    dictionaries, such as the concepts, shrink only slightly.
+
+    :return: The compacted value, which is ``value`` itself unless it was an
+             ordered dictionary or a tuple.
+    """
+    if isinstance(value, dict):
+        if type(value) is not dict:
+            value = dict(value)
+        for key in list(value):
+            child = value[key]
+            if key == "children" and not child:
+                del value[key]
+            else:
+                value[key] = compact_tree(child)
+        return value
+    if isinstance(value, list):
+        for index, child in enumerate(value):
+            value[index] = compact_tree(child)
+        return value
+    if isinstance(value, tuple):
+        return tuple(compact_tree(child) for child in value)
+    return value
+
+
+def share_subtrees(value, previous):
+    """
+    Replaces sub-trees of ``value`` that equal the matching sub-tree of an
+    earlier entry point with that earlier instance.
+
+    Dictionary entries are matched by key and list items by their ``"name"``
+    (or by position when they have none), so an extension reuses the base's
+    concept entries, role trees and unchanged presentation and dimension
+    children instead of holding its own copies. Children are shared first,
+    which lets the comparison of their parent short-circuit on identity. No
+    index is kept: the earlier entry points' data is the only lookup
+    structure. Shared containers must be treated as read-only.
+
+    :param value: Freshly extracted parser output.
+    :param previous: The same parser's output for each earlier entry point.
+    :return: ``value`` or an identical earlier instance.
+    """
+    previous = [p for p in previous if type(p) is type(value)]
+    if not previous:
+        return value
+
+    if isinstance(value, dict):
+        for key, child in value.items():
+            value[key] = share_subtrees(child, [p.get(key) for p in previous])
+    elif isinstance(value, list):
+        by_name = [{item["name"]: item for item in p if isinstance(item, dict) and "name" in item}
+                   for p in previous]
+        for index, child in enumerate(value):
+            if isinstance(child, dict) and "name" in child:
+                matches = [items.get(child["name"]) for items in by_name]
+            else:
+                matches = [p[index] if index < len(p) else None for p in previous]
+            value[index] = share_subtrees(child, matches)
+
+    for candidate in previous:
+        if is_identical_tree(candidate, value):
+            return candidate
+    return value
+
+
+def is_identical_tree(first, second):
+    """
+    Compares two parser outputs by type, order and value all the way down, so
+    that ``1``, ``1.0`` and ``True``, or the same children in another order,
+    are told apart where plain equality would not.
+    """
+    if first is second:
+        return True
+    if type(first) is not type(second):
+        return False
+    if isinstance(first, dict):
+        return len(first) == len(second) and all(
+            type(first_key) is type(second_key) and first_key == second_key
+            and is_identical_tree(first[first_key], second[second_key])
+            for first_key, second_key in zip(first, second)
+        )
+    if isinstance(first, (list, tuple)):
+        return len(first) == len(second) and all(map(is_identical_tree, first, second))
+    return first == second
+
+
+class TaxonomySession:
+    """
+    Loads several entry points through one controller and keeps their parsed
+    output side by side.
+
+    Each model is closed as soon as it has been parsed and only its parser
+    output is retained. Parts of that output equal to an earlier entry
+    point's are shared with it, so a common base is held in memory once and
+    each further extension adds roughly its own size.
+
+    When ``mirror_dir`` is given, remote imports of each entry point are
+    prefetched into that local mirror and arelle resolves them offline.
+
+    ``low_memory`` compacts each parser's output as it is produced and
+    hands freed memory back to the OS once the model is closed. ``memory``
+    keeps the peak RSS of the last load, its scope ("load", or "process"
+    where the peak cannot be reset), and the steady-state RSS measured once
+    the model is gone.
+    """
+
+    def __init__(self, cntlr=None, mirror_dir=None, low_memory=False):
+        self.cntlr = cntlr or Cntlr()
+        self.mirror_dir = mirror_dir
+        self.low_memory = low_memory
+        self.entry_points = OrderedDict()
+        self.memory = {}
+
+    def load(self, file_path):
+        """
+        Loads and parses an entry point and adds it to the session.
+
+        :param file_path: Path or URL of the entry point.
+        :return: The extracted taxonomy data for the entry point.
+        """
+        if self.mirror_dir:
+            report = prefetch(file_path, self.mirror_dir)
+            # An incomplete mirror would make offline loads fail on the missing documents
+            install_mirror(self.cntlr, self.mirror_dir, work_offline=not report["failed"])
+
+        peak_scope = "load" if reset_peak_rss() else "process"
+        model_xbrl = self.cntlr.modelManager.load(file_path)
+        if not model_xbrl:
+            raise Exception(f"Failed to load taxonomy: {file_path}")
+
+        try:
+            data = extract_taxonomy(model_xbrl, self.low_memory, list(self.entry_points.values()))
+        finally:
+            model_xbrl.close()
+            del model_xbrl
+            if self.low_memory:
+                release_free_memory()
+
+        self.entry_points[file_path] = data
+        self.memory = {"peak_rss": peak_rss(), "peak_scope": peak_scope, "steady_rss": current_rss()}
+        print(f"📦 Session holds {len(self.entry_points)} entry points "
+              f"({peak_scope} peak RSS {format_bytes(self.memory['peak_rss'])}, "
+              f"steady RSS {format_bytes(self.memory['steady_rss'])})")
+        return data
+
+    def names(self):
+        """
+        Returns a short display name for every loaded entry point.
+
+        The file name is used unless several entry points share it, in which
+        case those keep their full path so their columns stay distinguishable.
+        """
+        basenames = [os.path.basename(path) or path for path in self.entry_points]
+        return [
+            basename if basenames.count(basename) == 1 else path
+            for basename, path in zip(basenames, self.entry_points)
+        ]
+
+    def compare_concepts(self):
+        """
+        Lines up the concepts of every entry point.
+
+        :return: An ordered mapping of concept QName to a list of booleans,
+                 one per entry point, telling whether it defines the concept.
+        """
+        comparison = OrderedDict()
+        all_concepts = [data["concepts"] for data in self.entry_points.values()]
+        for qname in sorted(set().union(*all_concepts)):
+            comparison[qname] = [qname in concepts for concepts in all_concepts]
+        return comparison
+
+    def discard(self, file_path):
+        """Forgets a loaded entry point so its data can be freed once callers drop it."""
+        self.entry_points.pop(file_path, None)
+
+    def close(self):
+        """Releases the parsed data and shuts down the controller."""
+        self.entry_points.clear()
+        self.cntlr.close()
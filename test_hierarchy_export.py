@@ -0,0 +1,165 @@
+import csv
+import json
+
+import pytest
+
+from hierarchy_export import EXPORT_COLUMNS, export_taxonomy, iter_rows, output_names
+
+DATA = {
+    "concepts": {
+        "ex:Assets": {"type": "monetaryItemType", "balance": "debit"},
+        "ex:Cash": {"type": "monetaryItemType", "balance": "debit"},
+    },
+    "presentation": {
+        "ex:BalanceSheet": {"name": "ex:BalanceSheet", "abstract": True, "children": [
+            {"name": "ex:Assets", "abstract": False, "children": [
+                {"name": "ex:Cash", "abstract": False, "children": []},
+            ]},
+            {"name": "ex:Liabilities", "abstract": False, "children": []},
+        ]},
+    },
+    "dimensions": {
+        "[r1] RegionHypercube": {"name": "[r1] RegionHypercube", "abstract": True, "children": [
+            {"name": "RegionAxis", "abstract": True, "children": []},
+        ]},
+    },
+    "calculations": {
+        "[r2] Balance sheet": {
+            "Assets": {"weight": None, "children": {
+                "Cash": {"weight": 1.0, "children": {}},
+            }},
+        },
+        "[r3] Rootless": {
+            "[r3] Rootless": {"weight": None, "children": {
+                "A": {"weight": -1.0, "children": {}},
+            }},
+        },
+    },
+    "formulas": {
+        "set": {"set": {"type": "valueAssertionSet", "label": "Set", "children": {
+            "va1": {"type": "valueAssertion", "test": "$a gt 0", "label": "", "children": {}},
+        }}},
+    },
+}
+
+# The same data as low-memory mode leaves it: empty children are gone
+COMPACT_DATA = {
+    "presentation": {
+        "ex:BalanceSheet": {"name": "ex:BalanceSheet", "abstract": True, "children": [
+            {"name": "ex:Assets", "abstract": False, "children": [{"name": "ex:Cash", "abstract": False}]},
+            {"name": "ex:Liabilities", "abstract": False},
+        ]},
+    },
+    "dimensions": {
+        "[r1] RegionHypercube": {"name": "[r1] RegionHypercube", "abstract": True, "children": [
+            {"name": "RegionAxis", "abstract": True},
+        ]},
+    },
+    "calculations": {
+        "[r2] Balance sheet": {"Assets": {"weight": None, "children": {"Cash": {"weight": 1.0}}}},
+        "[r3] Rootless": {"[r3] Rootless": {"weight": None, "children": {"A": {"weight": -1.0}}}},
+    },
+    "formulas": {
+        "set": {"set": {"type": "valueAssertionSet", "label": "Set", "children": {
+            "va1": {"type": "valueAssertion", "label": ""},
+        }}},
+    },
+}
+
+
+def columns(rows, *names):
+    return [tuple(row[name] for name in names) for row in rows]
+
+
+def test_concept_rows():
+    rows = list(iter_rows(DATA, "concepts"))
+    assert columns(rows, "path", "depth", "order") == [("ex:Assets", 0, 0), ("ex:Cash", 0, 1)]
+    assert json.loads(rows[0]["attributes"]) == {"type": "monetaryItemType", "balance": "debit"}
+
+
+@pytest.mark.parametrize("data", [DATA, COMPACT_DATA])
+def test_presentation_rows(data):
+    rows = list(iter_rows(data, "presentation"))
+    assert columns(rows, "path", "parent", "child", "depth", "order") == [
+        ("ex:BalanceSheet", "", "ex:BalanceSheet", 0, 0),
+        ("ex:BalanceSheet / ex:Assets", "ex:BalanceSheet", "ex:Assets", 1, 0),
+        ("ex:BalanceSheet / ex:Assets / ex:Cash", "ex:Assets", "ex:Cash", 2, 0),
+        ("ex:BalanceSheet / ex:Liabilities", "ex:BalanceSheet", "ex:Liabilities", 1, 1),
+    ]
+    assert json.loads(rows[0]["attributes"]) == {"abstract": True}
+
+
+@pytest.mark.parametrize("data", [DATA, COMPACT_DATA])
+def test_dimension_rows_move_the_elr_prefix_to_its_column(data):
+    rows = list(iter_rows(data, "dimensions"))
+    assert columns(rows, "elr", "path", "parent", "child") == [
+        ("r1", "RegionHypercube", "", "RegionHypercube"),
+        ("r1", "RegionHypercube / RegionAxis", "RegionHypercube", "RegionAxis"),
+    ]
+
+
+@pytest.mark.parametrize("data", [DATA, COMPACT_DATA])
+def test_calculation_rows_use_the_same_elr_form(data):
+    rows = list(iter_rows(data, "calculations"))
+    assert columns(rows, "elr", "path", "weight") == [
+        ("r2", "Assets", None),
+        ("r2", "Assets / Cash", 1.0),
+        ("r3", "Rootless", None),
+        ("r3", "Rootless / A", -1.0),
+    ]
+
+
+@pytest.mark.parametrize("data", [DATA, COMPACT_DATA])
+def test_formula_rows(data):
+    rows = list(iter_rows(data, "formulas"))
+    assert columns(rows, "path", "depth") == [("set", 0), ("set / va1", 1)]
+    assert json.loads(rows[0]["attributes"]) == {"type": "valueAssertionSet", "label": "Set"}
+    assert json.loads(rows[1]["attributes"]) == {"type": "valueAssertion"}
+
+
+def test_unknown_tab():
+    with pytest.raises(ValueError):
+        iter_rows(DATA, "tables")
+
+
+def test_csv_round_trip(tmp_path):
+    output_path = tmp_path / "export.csv"
+    stats = export_taxonomy(DATA, str(output_path))
+
+    with open(output_path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        assert reader.fieldnames == EXPORT_COLUMNS
+        read_rows = list(reader)
+
+    expected = [row for tab in ("concepts", "presentation", "calculations", "dimensions", "formulas")
+                for row in iter_rows(DATA, tab)]
+    assert stats["rows"] == len(read_rows) == len(expected) == 14
+    assert read_rows == [{column: "" if row[column] is None else str(row[column]) for column in EXPORT_COLUMNS}
+                         for row in expected]
+
+
+@pytest.mark.parametrize("chunk_size, expected_progress", [
+    (1, [1, 2, 3, 4]),
+    (2, [2, 4]),
+    (3, [3, 4]),
+    (4, [4]),
+    (10, [4]),
+])
+def test_chunks_split_at_the_chunk_size(tmp_path, chunk_size, expected_progress):
+    progress = []
+    stats = export_taxonomy(DATA, str(tmp_path / "export.csv"), tabs=["presentation"],
+                            chunk_size=chunk_size, progress=progress.append)
+    assert stats["rows"] == 4
+    assert progress == expected_progress
+
+
+def test_unsupported_format(tmp_path):
+    with pytest.raises(ValueError):
+        export_taxonomy(DATA, str(tmp_path / "export.txt"))
+
+
+def test_output_names_tell_same_file_names_apart():
+    assert output_names(["a/x/entry.xsd", "b/x/entry.xsd", "other.xsd"]) == ["a_x_entry", "b_x_entry", "other"]
+    assert output_names(["http://example.com/fr/2024/entry.xsd", "entry.xsd"]) == ["2024_entry", "entry"]
+    with pytest.raises(ValueError):
+        output_names(["entry.xsd", "entry.xsd"])
@@ -0,0 +1,114 @@
+from table_parser import build_member_lookup, get_relationship_members, resolve_axis_leaves
+
+
+class Setting:
+    def __init__(self, local_name, text):
+        self.localName = local_name
+        self.text = text
+
+
+class Node:
+    """Stands in for an arelle definition node."""
+
+    def __init__(self, label, local_name="ruleNode", abstract=False, settings=()):
+        self.xlinkLabel = label
+        self.localName = local_name
+        self.isAbstract = abstract
+        self.settings = [Setting(*setting) for setting in settings]
+
+    def iterchildren(self):
+        return iter(self.settings)
+
+
+class Relationship:
+    def __init__(self, to_node):
+        self.toModelObject = to_node
+
+
+class RelationshipSet:
+    """Stands in for an arelle relationship set built from parent -> children pairs."""
+
+    def __init__(self, edges):
+        self.edges = edges
+
+    def fromModelObject(self, node):
+        return [Relationship(child) for child in self.edges.get(node, [])]
+
+
+DIMENSIONS = {
+    "[r1] RegionAxis": {"name": "[r1] RegionAxis", "children": [{"name": "RegionDomain"}]},
+    "[r1] RegionDomain": {"name": "[r1] RegionDomain", "children": [
+        {"name": "Europe", "children": [{"name": "Germany"}, {"name": "France"}]},
+        {"name": "America"},
+    ]},
+    "[r2] RegionDomain": {"name": "[r2] RegionDomain", "children": [{"name": "Asia"}]},
+}
+
+
+def test_build_member_lookup_keeps_elrs_apart_and_merges_them():
+    lookup = build_member_lookup(DIMENSIONS)
+
+    assert lookup["r1"]["RegionAxis"] == ["RegionDomain"]
+    assert lookup["r1"]["RegionDomain"] == ["Europe", "America"]
+    assert lookup["r1"]["Europe"] == ["Germany", "France"]
+    assert lookup["r2"]["RegionDomain"] == ["Asia"]
+    assert lookup[None]["RegionDomain"] == ["Europe", "America", "Asia"]
+
+
+def test_get_relationship_members_axes_and_generations():
+    children_by_name = build_member_lookup(DIMENSIONS)["r1"]
+
+    assert get_relationship_members(["RegionDomain"], children_by_name, True, 0) == [
+        (0, "RegionDomain"), (1, "Europe"), (2, "Germany"), (2, "France"), (1, "America")
+    ]
+    assert get_relationship_members(["RegionDomain"], children_by_name, False, 1) == [
+        (0, "Europe"), (0, "America")
+    ]
+    assert get_relationship_members(["Europe"], children_by_name, True, 1) == [
+        (0, "Europe"), (1, "Germany"), (1, "France")
+    ]
+
+
+def test_get_relationship_members_survives_cycles():
+    assert get_relationship_members(["A"], {"A": ["B"], "B": ["A", "C"]}, True, 0) == [
+        (0, "A"), (1, "B"), (2, "C")
+    ]
+
+
+def test_resolve_axis_leaves_rule_aspect_and_relationship_nodes():
+    breakdown = Node("breakdown", "breakdown")
+    total = Node("Total", abstract=True)
+    assets = Node("Assets")
+    region = Node("region", "dimensionRelationshipNode", settings=[
+        ("dimension", "ex:RegionAxis"),
+        ("relationshipSource", "ex:Europe"),
+        ("linkrole", "http://example.com/role/r1"),
+        ("formulaAxis", "descendant"),
+    ])
+    country = Node("country", "aspectNode", settings=[("dimensionAspect", "ex:CountryAxis")])
+
+    tree_sets = [RelationshipSet({breakdown: [total]})]
+    subtree_sets = [RelationshipSet({total: [assets, region, country]})]
+    leaves = resolve_axis_leaves([breakdown], tree_sets, subtree_sets, build_member_lookup(DIMENSIONS))
+
+    assert leaves == [
+        ("Total", "Assets"),
+        ("Total", "Germany"),
+        ("Total", "France"),
+        ("Total", "CountryAxis (open)"),
+    ]
+
+
+def test_resolve_axis_leaves_crosses_breakdowns_and_skips_cycles():
+    first, second = Node("first", "breakdown"), Node("second", "breakdown")
+    a, b, loop = Node("A"), Node("B"), Node("Loop")
+
+    tree_sets = [RelationshipSet({first: [a], second: [loop]})]
+    subtree_sets = [RelationshipSet({a: [], loop: [b, loop], b: [loop]})]
+    leaves = resolve_axis_leaves([first, second], tree_sets, subtree_sets, {})
+
+    assert leaves == [("A", "Loop"), ("A", "Loop", "B")]
+
+
+def test_resolve_axis_leaves_without_breakdowns():
+    assert resolve_axis_leaves([], [], [], {}) == []
@@ -0,0 +1,166 @@
+import functools
+import json
+import threading
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from pathlib import Path
+
+import pytest
+
+from taxonomy_prefetch import prefetch, install_mirror
+
+BASE_XSD = """<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+    xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink"
+    xmlns:xbrldt="http://xbrl.org/2005/xbrldt">
+  <xsd:annotation><xsd:appinfo>
+    <link:linkbaseRef xlink:href="sub/base_pre.xml"/>
+  </xsd:appinfo></xsd:annotation>
+  <xsd:import schemaLocation="sub/types.xsd"/>
+  <xsd:element name="TypedAxis" xbrldt:typedDomainRef="typed.xsd#domain"/>
+</xsd:schema>"""
+
+PRESENTATION_XML = """<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase"
+    xmlns:xlink="http://www.w3.org/1999/xlink"
+    xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+    xsi:schemaLocation="http://example.com/custom custom.xsd">
+  <link:loc xlink:href="../base.xsd#TypedAxis"/>
+</link:linkbase>"""
+
+EMPTY_XSD = '<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema"/>'
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Serves a small remote taxonomy from a temporary directory."""
+    root = tmp_path / "remote"
+    (root / "sub").mkdir(parents=True)
+    (root / "base.xsd").write_text(BASE_XSD)
+    (root / "typed.xsd").write_text(EMPTY_XSD)
+    (root / "sub" / "types.xsd").write_text(EMPTY_XSD)
+    (root / "sub" / "custom.xsd").write_text(EMPTY_XSD)
+    (root / "sub" / "base_pre.xml").write_text(PRESENTATION_XML)
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=str(root)))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", root
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def write_extension(tmp_path, base_url, comment=""):
+    entry_point = tmp_path / "ext.xsd"
+    entry_point.write_text(
+        f'<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema">{comment}'
+        f'<xsd:import schemaLocation="{base_url}/base.xsd"/></xsd:schema>'
+    )
+    return str(entry_point)
+
+
+def make_controller(cache_dir):
+    """Stands in for an arelle controller whose web cache lives in ``cache_dir``."""
+    class WebCache:
+        workOffline = None
+
+        def urlToCacheFilepath(self, url):
+            return str(cache_dir / url.split("://", 1)[1].replace(":", "_"))
+
+    class Controller:
+        webCache = WebCache()
+
+    return Controller()
+
+
+def statuses(report):
+    return {t["url"]: t["status"] for t in report["documents"]}
+
+
+def test_prefetch_mirrors_whole_graph(tmp_path, server):
+    base_url, _ = server
+    entry_point = write_extension(tmp_path, base_url)
+    mirror_dir = tmp_path / "mirror"
+
+    report = prefetch(entry_point, str(mirror_dir), max_workers=4)
+
+    remote = {f"{base_url}/{path}" for path in
+              ("base.xsd", "typed.xsd", "sub/types.xsd", "sub/custom.xsd", "sub/base_pre.xml")}
+    assert report["failed"] == 0
+    assert report["local"] == 1
+    assert {url for url, status in statuses(report).items() if status == "fetched"} == remote
+    assert all(t["seconds"] >= 0 for t in report["documents"])
+
+    index = json.loads((mirror_dir / "index.json").read_text())
+    assert set(index) == remote
+    for url, digest in index.items():
+        assert (mirror_dir / "objects" / digest[:2] / digest).exists()
+
+
+def test_second_run_is_served_from_mirror(tmp_path, server):
+    base_url, _ = server
+    entry_point = write_extension(tmp_path, base_url)
+    mirror_dir = str(tmp_path / "mirror")
+    prefetch(entry_point, mirror_dir)
+
+    # Unchanged graph: nothing is parsed or fetched
+    report = prefetch(entry_point, mirror_dir)
+    assert report["up_to_date"]
+    assert report["documents"] == []
+
+    # A changed local document forces a walk, served entirely from the mirror
+    write_extension(tmp_path, base_url, comment="<!-- edited -->")
+    report = prefetch(entry_point, mirror_dir)
+    assert not report["up_to_date"]
+    assert report["fetched"] == report["failed"] == 0
+    assert report["mirrored"] == 5
+
+
+def test_failed_document_keeps_graph_incomplete(tmp_path, server):
+    base_url, root = server
+    (root / "typed.xsd").unlink()
+    entry_point = write_extension(tmp_path, base_url)
+    mirror_dir = str(tmp_path / "mirror")
+
+    report = prefetch(entry_point, mirror_dir)
+    assert report["failed"] == 1
+    assert statuses(report)[f"{base_url}/typed.xsd"].startswith("failed")
+
+    assert not prefetch(entry_point, mirror_dir)["up_to_date"]
+
+
+def test_install_mirror_stays_online_when_incomplete(tmp_path, server):
+    base_url, _ = server
+    entry_point = write_extension(tmp_path, base_url)
+    mirror_dir = str(tmp_path / "mirror")
+    prefetch(entry_point, mirror_dir)
+
+    cntlr = make_controller(tmp_path / "cache")
+    assert install_mirror(cntlr, mirror_dir, work_offline=False) == 5
+    assert cntlr.webCache.workOffline is False
+    assert (tmp_path / "cache").exists()
+
+    install_mirror(cntlr, mirror_dir)
+    assert cntlr.webCache.workOffline is True
+
+
+def test_install_mirror_replaces_stale_cache_files(tmp_path, server):
+    base_url, _ = server
+    entry_point = write_extension(tmp_path, base_url)
+    mirror_dir = str(tmp_path / "mirror")
+    prefetch(entry_point, mirror_dir)
+
+    cntlr = make_controller(tmp_path / "cache")
+    stale = Path(cntlr.webCache.urlToCacheFilepath(f"{base_url}/base.xsd"))
+    stale.parent.mkdir(parents=True)
+    stale.write_text(EMPTY_XSD)
+    untouched = Path(cntlr.webCache.urlToCacheFilepath(f"{base_url}/typed.xsd"))
+    untouched.write_text(EMPTY_XSD)
+    untouched_inode = untouched.stat().st_ino
+
+    install_mirror(cntlr, mirror_dir)
+    assert stale.read_text() == BASE_XSD
+    assert untouched.stat().st_ino == untouched_inode
+    assert not list(stale.parent.glob("*.tmp"))
@@ -0,0 +1,63 @@
+import copy
+
+from taxonomy_session import compact_tree, is_identical_tree, share_subtrees
+
+
+def make_presentation(sections=100, lines=100):
+    """Builds presentation parser output with ``sections`` roots of ``lines`` children each."""
+    return {
+        f"ex:Section{s}": {"name": f"ex:Section{s}", "abstract": True, "children": [
+            {"name": f"ex:Line{s}_{l}", "abstract": False, "children": []} for l in range(lines)
+        ]}
+        for s in range(sections)
+    }
+
+
+def test_extension_shares_unchanged_sections_with_its_base():
+    base = make_presentation()
+    extension = make_presentation()
+    extension["ex:Section7"]["children"].insert(3, {"name": "ex:Extra", "abstract": False, "children": []})
+
+    shared = share_subtrees(extension, [base])
+
+    assert shared is not base
+    for name, section in base.items():
+        if name != "ex:Section7":
+            assert shared[name] is section
+    changed = shared["ex:Section7"]
+    assert changed is not base["ex:Section7"]
+    # Siblings of the added line are matched by name, not position, and still shared
+    assert changed["children"][3]["name"] == "ex:Extra"
+    assert changed["children"][4] is base["ex:Section7"]["children"][3]
+    assert changed["children"][-1] is base["ex:Section7"]["children"][-1]
+
+
+def test_identical_entry_point_is_shared_whole():
+    base = compact_tree(make_presentation(10, 10))
+    assert share_subtrees(compact_tree(make_presentation(10, 10)), [base]) is base
+
+
+def test_shares_with_any_earlier_entry_point():
+    first = {"a": {"x": [1, 2]}, "b": {"y": [3]}}
+    second = {"a": {"x": [9]}, "b": {"y": [4]}}
+    value = {"a": {"x": [9]}, "b": {"y": [3]}}
+
+    shared = share_subtrees(value, [first, second])
+    assert shared["a"] is second["a"]
+    assert shared["b"] is first["b"]
+
+
+def test_equal_values_of_other_types_are_not_shared():
+    base = {"weight": 1, "children": [{"name": "a", "value": 1}, {"name": "b", "value": True}]}
+    for other in (1.0, True):
+        value = {"weight": other, "children": [{"name": "a", "value": other}, {"name": "b", "value": 1}]}
+        shared = share_subtrees(copy.deepcopy(value), [base])
+        assert type(shared["weight"]) is type(other)
+        assert type(shared["children"][0]["value"]) is type(other)
+        assert type(shared["children"][1]["value"]) is int
+
+
+def test_order_matters():
+    assert not is_identical_tree({"a": 1, "b": 2}, {"b": 2, "a": 1})
+    assert not is_identical_tree([1, 2], [2, 1])
+    assert is_identical_tree({"a": [1, (2, "x")]}, {"a": [1, (2, "x")]})